@@ -0,0 +1,258 @@
+"""Canonical scanner for oversized Rust functions.
+
+Driver scripts import find_large_functions from here and only vary their
+allow-lists; keep all scanning logic in this module.
+
+The only optional dependency is tree-sitter, used for exact parsing when
+installed. The fallback path deliberately sticks to CPython's built-in C
+primitives (re, bytes.count, str.find) rather than a JIT such as numba:
+its hot loops already run in C, and a JIT adds import cost plus a
+compile/cache step to every CI run for no measurable gain here.
+"""
+
+import bisect
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+try:
+    import tree_sitter
+    import tree_sitter_rust
+except ImportError:
+    tree_sitter = None
+
+SCAN_ROOTS = ("src", "crates")
+
+# Per-file results keyed by (mtime_ns, size) so unchanged files skip the scan
+CACHE_FILE = ".complexity-cache.json"
+
+# Directories that never hold hand-written code we gate on
+SKIP_DIRS = {"target", "vendor", "node_modules", ".git", "generated"}
+
+# Match function definitions; bytes patterns run at full C speed without
+# paying for a UTF-8 decode of each file
+FN_RE = re.compile(
+    rb"^[ \t]*(?:pub(?:\([^)]*\))?\s+)?(?:const\s+)?(?:async\s+)?(?:unsafe\s+)?"
+    rb"(?:extern\s+)?fn\s+(\w+)",
+    re.MULTILINE,
+)
+
+if tree_sitter is not None:
+    RUST_LANGUAGE = tree_sitter.Language(tree_sitter_rust.language())
+    PARSER = tree_sitter.Parser(RUST_LANGUAGE)
+    # Closures are closure_expression nodes, so they are never matched here
+    FN_QUERY = tree_sitter.Query(
+        RUST_LANGUAGE, "(function_item name: (identifier) @name) @fn"
+    )
+
+# Spans whose contents must not be brace-counted
+STRIP_RE = re.compile(
+    rb'r#+"(?:[^"]|"(?!#))*"#+'  # raw strings
+    rb'|"(?:\\.|[^"\\])*"'  # string literals
+    rb"|'(?:\\[^']*|[^'\\])'"  # char literals (one char or escape; not lifetimes)
+    rb"|//[^\n]*"  # line comments
+    rb"|/\*.*?\*/",  # block comments
+    re.DOTALL,
+)
+
+BRACE_RE = re.compile(rb"[{}]")
+
+# Tokens that decide where a signature ends and whether a body follows
+SIG_RE = re.compile(rb"[;{}()\[\]]")
+
+
+def _strip_literals(content):
+    """Blank out literal/comment spans, preserving newlines for line numbers."""
+    return STRIP_RE.sub(lambda m: b"\n" * m.group(0).count(b"\n"), content)
+
+
+def _newline_index(content):
+    """Offsets of every newline, built with C-level find calls."""
+    offsets = []
+    start = 0
+    while True:
+        i = content.find(b"\n", start)
+        if i < 0:
+            return offsets
+        offsets.append(i)
+        start = i + 1
+
+
+def _iter_rust_files(src_dir):
+    """Yield paths of .rs files under src_dir via os.scandir (no Path churn)."""
+    stack = [src_dir]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIP_DIRS:
+                        stack.append(entry.path)
+                elif entry.name.endswith(".rs"):
+                    yield entry.path
+
+
+def _scan_file_treesitter(rs_file, src_dir, max_lines):
+    violations = []
+    with open(rs_file, "rb") as f:
+        tree = PARSER.parse(f.read())
+
+    for _pattern, captures in tree_sitter.QueryCursor(FN_QUERY).matches(
+        tree.root_node
+    ):
+        fn_node = captures["fn"][0]
+        fn_lines = fn_node.end_point[0] - fn_node.start_point[0] + 1
+
+        if fn_lines > max_lines:
+            fn_name = captures["name"][0].text.decode()
+            rel_path = os.path.relpath(rs_file, src_dir)
+            violations.append(
+                (rel_path, fn_name, fn_node.start_point[0] + 1, fn_lines)
+            )
+
+    return violations
+
+
+def _scan_file_regex(rs_file, src_dir, max_lines):
+    violations = []
+    with open(rs_file, "rb") as f:
+        content = f.read()
+
+    # Cheap substring gate; the regex stays the authority on real matches
+    if b"fn " not in content:
+        return violations
+
+    # One strip pass per file; matching over the stripped text also stops
+    # literals and comments from yielding phantom fn definitions
+    stripped = _strip_literals(content)
+    # Index newlines once so line numbers are a log-time bisect per match
+    # rather than an O(file size) count of the prefix
+    newlines = _newline_index(stripped)
+
+    for match in FN_RE.finditer(stripped):
+        fn_name = match.group(1).decode("ascii")
+        fn_start = bisect.bisect_right(newlines, match.start()) + 1
+
+        # The body is the balanced-brace span from the first { after the
+        # signature; a ; first means a bodyless trait/extern declaration.
+        # Both are only meaningful at paren/bracket depth 0 — `;` also
+        # appears inside array types like [u8; 32] and const generics
+        body_start = -1
+        depth = 0
+        for token in SIG_RE.finditer(stripped, match.end()):
+            ch = token.group()
+            if ch in (b"(", b"["):
+                depth += 1
+            elif ch in (b")", b"]"):
+                depth -= 1
+            elif depth == 0:
+                if ch == b"{":
+                    body_start = token.start()
+                break  # depth-0 ; (or stray }) means no body follows
+        if body_start < 0:
+            continue
+
+        depth = 0
+        for brace in BRACE_RE.finditer(stripped, body_start):
+            if brace.group() == b"{":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    body_end = brace.start()
+                    break
+        else:
+            continue  # unbalanced braces; let the compiler complain instead
+
+        # Inclusive line span, matching tree-sitter's start/end points
+        end_line = bisect.bisect_right(newlines, body_end) + 1
+        fn_lines = end_line - fn_start + 1
+
+        if fn_lines > max_lines:
+            rel_path = os.path.relpath(rs_file, src_dir)
+            violations.append((rel_path, fn_name, fn_start, fn_lines))
+
+    return violations
+
+
+if tree_sitter is not None:
+    _scan_file = _scan_file_treesitter
+    ENGINE = "tree-sitter"
+else:
+    _scan_file = _scan_file_regex
+    ENGINE = "regex"
+
+
+def _scan_task(task, max_lines):
+    src_dir, rs_file = task
+    return _scan_file(rs_file, src_dir, max_lines)
+
+
+def _load_cache(max_lines):
+    try:
+        with open(CACHE_FILE) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    # A different limit or engine invalidates every cached result; the two
+    # engines can disagree, and mixed results would mask that
+    if cache.get("max_lines") != max_lines or cache.get("engine") != ENGINE:
+        return {}
+    return cache.get("files", {})
+
+
+def _save_cache(files, max_lines):
+    try:
+        with open(CACHE_FILE, "w") as f:
+            json.dump({"max_lines": max_lines, "engine": ENGINE, "files": files}, f)
+    except OSError:
+        pass
+
+
+def iter_large_functions(src_dirs=SCAN_ROOTS, max_lines=100):
+    """Yield violations lazily so a fail-fast caller can stop at the first one.
+
+    The cache is only written back when the iterator runs to completion;
+    an abandoned scan simply re-scans next time.
+    """
+    cached = _load_cache(max_lines)
+    new_cache = {}
+    to_scan = []
+
+    for src_dir in src_dirs:
+        for rs_file in _iter_rust_files(src_dir):
+            st = os.stat(rs_file)
+            entry = cached.get(rs_file)
+            if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                new_cache[rs_file] = entry
+                yield from (tuple(v) for v in entry[2])
+            else:
+                to_scan.append((src_dir, rs_file, st))
+
+    # Files are independent, so shard them across all cores; workers inherit
+    # the module-scope regex/parser via fork (or rebuild it once on spawn)
+    if to_scan:
+        executor = ProcessPoolExecutor()
+        try:
+            results = executor.map(
+                partial(_scan_task, max_lines=max_lines),
+                [(src_dir, rs_file) for src_dir, rs_file, _ in to_scan],
+                chunksize=8,
+            )
+            for (_, rs_file, st), file_violations in zip(to_scan, results):
+                new_cache[rs_file] = [st.st_mtime_ns, st.st_size, file_violations]
+                yield from file_violations
+        except GeneratorExit:
+            # A fail-fast caller broke out: drop the queued files instead of
+            # waiting for the whole tree to finish scanning
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+
+    # Entries for deleted files drop out because only seen files are kept
+    _save_cache(new_cache, max_lines)
+
+
+def find_large_functions(src_dirs=SCAN_ROOTS, max_lines=100):
+    return list(iter_large_functions(src_dirs, max_lines))
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+import os
+import sys
+
+from _complexity import iter_large_functions
+
+# Functions allowed to exceed the limit, baselined against the current tree.
+# Counts here are physical lines, so this list is broader than the inline
+# #[allow(clippy::too_many_lines)] markers (clippy skips comments/blanks).
+# Shrink it as functions get refactored; never add to it without a beads entry.
+ALLOWED_FUNCTIONS = {
+    "commands/capture.rs:execute",
+    "commands/compact/apply.rs:execute",
+    "commands/dispatch/link.rs:handle_link",
+    "commands/doctor/database.rs:check_semantic_link_types",
+    "commands/doctor/mod.rs:execute",
+    "commands/dump/serialize.rs:serialize_pack_records",
+    "commands/index.rs:execute",
+    "commands/link/add.rs:execute",
+    "commands/link/human.rs:output_path_human",
+    "commands/link/human.rs:output_tree_human",
+    "commands/link/human.rs:print_tree",
+    "commands/link/json.rs:output_path_json",
+    "commands/link/json.rs:output_tree_json",
+    "commands/link/list.rs:execute",
+    "commands/link/materialize.rs:execute",
+    "commands/link/path.rs:execute",
+    "commands/load/loader.rs:load_notes",
+    "commands/load/mod.rs:execute",
+    "commands/prime/mod.rs:execute",
+    "commands/search/mod.rs:execute",
+    "commands/show/mod.rs:execute",
+    "commands/show/mod.rs:execute_show_links",
+    "commands/status.rs:collect_status",
+    "commands/update.rs:execute",
+    "commands/workspace/merge.rs:execute",
+    "commands/workspace/new.rs:execute",
+    "qipu-core/src/db/notes/read.rs:list_notes",
+    "qipu-core/src/db/rebuild.rs:rebuild",
+    "qipu-core/src/db/rebuild.rs:rebuild_resume",
+    "qipu-core/src/git.rs:get_ids_from_all_branches",
+    "qipu-core/src/graph/algos/bfs.rs:process_neighbor",
+    "qipu-core/src/graph/algos/dijkstra.rs:dijkstra_traverse",
+    "qipu-core/src/graph/algos/dijkstra.rs:process_neighbor_dijkstra",
+    "qipu-core/src/graph/bfs.rs:dijkstra_search",
+    "qipu-core/src/index/links.rs:extract_links",
+    "qipu-core/src/store/mod.rs:init_at",
+}
+
+if __name__ == "__main__":
+    # CI only needs pass/fail, so stop at the first offender there;
+    # the default full report is for working through violations locally
+    fail_fast = "--fail-fast" in sys.argv[1:] or os.environ.get("CI") == "true"
+
+    violation_found = False
+    for file, fn, line_num, lines in iter_large_functions(max_lines=100):
+        key = f"{file}:{fn}"
+        if key not in ALLOWED_FUNCTIONS:
+            print(f"ERROR: {file}:{fn} (line {line_num}) has {lines} lines (>100)")
+            violation_found = True
+            if fail_fast:
+                break
+
+    if violation_found:
+        print()
+        print("Functions exceeding 100 lines trigger CI failure. Options:")
+        print("  - Refactor to reduce complexity")
+        print("  - Request exception in beads")
+        sys.exit(1)